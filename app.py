@@ -6,12 +6,15 @@ against live web data using AI.
 """
 
 import streamlit as st
+import hashlib
 import os
+import time
+from collections import Counter
 from dotenv import load_dotenv
 
 from src.pdf_extractor import extract_text_from_pdf
 from src.claim_extractor import extract_claims
-from src.verifier import verify_claims
+from src.verifier import verify_claims, is_failed_result
 from src.models import VerificationStatus
 
 # Load environment variables
@@ -25,90 +28,53 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        padding: 1rem 0;
-    }
-    
-    .sub-header {
-        text-align: center;
-        color: #666;
-        margin-bottom: 2rem;
-    }
-    
-    .status-verified {
-        background-color: #d4edda;
-        border-left: 4px solid #28a745;
-        padding: 1rem;
-        border-radius: 0.25rem;
-        margin: 0.5rem 0;
-    }
-    
-    .status-inaccurate {
-        background-color: #fff3cd;
-        border-left: 4px solid #ffc107;
-        padding: 1rem;
-        border-radius: 0.25rem;
-        margin: 0.5rem 0;
-    }
-    
-    .status-false {
-        background-color: #f8d7da;
-        border-left: 4px solid #dc3545;
-        padding: 1rem;
-        border-radius: 0.25rem;
-        margin: 0.5rem 0;
-    }
-    
-    .claim-card {
-        background: white;
-        border-radius: 10px;
-        padding: 1.5rem;
-        margin: 1rem 0;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-    }
-    
-    .stats-container {
-        display: flex;
-        justify-content: space-around;
-        padding: 1rem;
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    
-    .stat-box {
-        text-align: center;
-        color: white;
-    }
-    
-    .stat-number {
-        font-size: 2rem;
-        font-weight: bold;
-    }
-    
-    .stat-label {
-        font-size: 0.9rem;
-        opacity: 0.9;
-    }
-    
-    .upload-area {
-        border: 2px dashed #667eea;
-        border-radius: 10px;
-        padding: 2rem;
-        text-align: center;
-        background: #f8f9ff;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS for styling, read from a static asset once per server process
+@st.cache_resource
+def _load_css() -> str:
+    """Return the app stylesheet wrapped in a style tag."""
+    css_path = os.path.join(os.path.dirname(__file__), "assets", "style.css")
+    with open(css_path) as f:
+        return f"<style>\n{f.read()}\n</style>"
+
+
+st.markdown(_load_css(), unsafe_allow_html=True)
+
+
+# Cache each pipeline stage by content digest so Streamlit reruns (widget
+# interactions, page refreshes) don't reprocess an already-analyzed document.
+# Underscore-prefixed arguments are excluded from the cache key.
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_extract_text(pdf_sha256: str, _pdf_bytes: bytes):
+    """Extract page text once per unique PDF."""
+    return extract_text_from_pdf(_pdf_bytes)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_extract_claims(pdf_sha256: str, groq_key: str, _pages):
+    """Extract claims once per unique PDF and API key."""
+    return extract_claims(_pages, groq_key)
+
+
+class _VerificationIncomplete(Exception):
+    """Raised so runs with transient failures are not memoized; carries the results."""
+
+    def __init__(self, results):
+        super().__init__("verification incomplete")
+        self.results = results
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_verify(claims_sha256: str, groq_key: str, tavily_key: str, _claims, _progress_callback=None):
+    """Verify a claim set once per unique set of claims and API keys."""
+    results = verify_claims(_claims, groq_key, tavily_key, _progress_callback)
+
+    # A raise keeps the entry out of the cache, so re-running the analysis
+    # retries claims that failed on an outage or rate limit
+    if any(is_failed_result(r) for r in results):
+        raise _VerificationIncomplete(results)
+
+    return results
 
 
 def get_status_emoji(status: VerificationStatus) -> str:
@@ -184,10 +150,12 @@ def main():
         st.subheader("📊 Quick Stats")
         if "results" in st.session_state and st.session_state.results:
             results = st.session_state.results
-            verified = sum(1 for r in results if r.status == VerificationStatus.VERIFIED)
-            inaccurate = sum(1 for r in results if r.status == VerificationStatus.INACCURATE)
-            false = sum(1 for r in results if r.status == VerificationStatus.FALSE)
-            
+            # One pass over the results instead of one per status
+            counts = Counter(r.status for r in results)
+            verified = counts[VerificationStatus.VERIFIED]
+            inaccurate = counts[VerificationStatus.INACCURATE]
+            false = counts[VerificationStatus.FALSE]
+
             stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
             stat_col1.metric("Total Claims", len(results))
             stat_col2.metric("Verified", verified, delta=None)
@@ -209,17 +177,28 @@ def main():
         display_results(st.session_state.results)
 
 
+# Progress-bar weight per stage, based on where the time actually goes:
+# text extraction is nearly instant, claim extraction is a few LLM calls,
+# and verification (one search + verdict per claim) dominates
+_TEXT_DONE_PCT = 5
+_CLAIMS_DONE_PCT = 20
+
+# Minimum seconds between progress-bar writes; each write redraws the bar
+_PROGRESS_INTERVAL = 0.1
+
+
 def process_document(uploaded_file, openai_key: str, tavily_key: str):
     """Process the uploaded PDF and verify claims."""
-    
+
     with st.spinner("Processing document..."):
         # Step 1: Extract text
         progress_bar = st.progress(0, text="Extracting text from PDF...")
         
         try:
             pdf_bytes = uploaded_file.read()
-            pages = extract_text_from_pdf(pdf_bytes)
-            
+            pdf_sha256 = hashlib.sha256(pdf_bytes).hexdigest()
+            pages = _cached_extract_text(pdf_sha256, pdf_bytes)
+
             if not pages:
                 st.error("Could not extract any text from the PDF.")
                 return
@@ -240,11 +219,11 @@ def process_document(uploaded_file, openai_key: str, tavily_key: str):
             return
         
         # Step 2: Extract claims
-        progress_bar.progress(33, text="Identifying claims...")
+        progress_bar.progress(_TEXT_DONE_PCT, text="Identifying claims...")
         
         try:
-            claims = extract_claims(pages, openai_key)
-            
+            claims = _cached_extract_claims(pdf_sha256, openai_key, pages)
+
             if not claims:
                 st.warning("No verifiable claims found in the document. Check the debug output above for details.")
                 return
@@ -265,18 +244,36 @@ def process_document(uploaded_file, openai_key: str, tavily_key: str):
             return
         
         # Step 3: Verify claims
-        progress_bar.progress(66, text="Verifying claims against web data...")
-        
+        progress_bar.progress(_CLAIMS_DONE_PCT, text="Verifying claims against web data...")
+
+        last_update = 0.0
+
         def update_progress(current, total, claim_text):
-            progress = 66 + int((current / total) * 34)
+            nonlocal last_update
+
+            # Throttle redraws; concurrent verification can finish claims in bursts
+            now = time.monotonic()
+            if now - last_update < _PROGRESS_INTERVAL and current < total:
+                return
+            last_update = now
+
+            progress = _CLAIMS_DONE_PCT + int((current / total) * (100 - _CLAIMS_DONE_PCT))
             progress_bar.progress(progress, text=f"Verifying claim {current}/{total}...")
         
         try:
-            results = verify_claims(claims, openai_key, tavily_key, update_progress)
+            claims_sha256 = hashlib.sha256(
+                "\x1e".join(c.text for c in claims).encode()
+            ).hexdigest()
+            try:
+                results = _cached_verify(claims_sha256, openai_key, tavily_key, claims, update_progress)
+            except _VerificationIncomplete as incomplete:
+                results = incomplete.results
+                st.warning("⚠️ Some claims could not be verified. Run the analysis again to retry them.")
+
             st.session_state.results = results
             progress_bar.progress(100, text="Complete!")
             st.success("✅ Verification complete!")
-            
+
         except Exception as e:
             st.error(f"Error verifying claims: {str(e)}")
             return
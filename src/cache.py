@@ -0,0 +1,60 @@
+"""Content-addressable disk cache for LLM responses and search results."""
+
+import hashlib
+import re
+from typing import Optional
+
+from diskcache import Cache
+
+
+# Bump this when a prompt changes so stale responses are not reused
+PROMPT_VERSION = "v1"
+
+# Search results go stale, so expire them after an hour
+SEARCH_TTL_SECONDS = 3600
+
+_llm_cache = Cache(".cache/extract")
+_search_cache = Cache(".cache/search")
+
+
+def make_key(*parts: str) -> str:
+    """
+    Build a content-addressed cache key.
+
+    Args:
+        *parts: Strings that uniquely identify the request
+            (prompt version, model name, input text, ...).
+
+    Returns:
+        Hex digest usable as a cache key.
+    """
+    payload = "|".join(parts)
+    # blake2b is faster than sha256 on these small inputs; 16 bytes is
+    # plenty of collision resistance for a cache key
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for a key, or None on a miss."""
+    return _llm_cache.get(key)
+
+
+def put(key: str, value: str) -> None:
+    """Store a response under a key."""
+    _llm_cache.set(key, value)
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different phrasings share a key."""
+    return re.sub(r'\s+', ' ', query.strip().lower())
+
+
+def get_search(query: str) -> Optional[dict]:
+    """Return the cached search response for a query, or None on a miss."""
+    return _search_cache.get(make_key("search", normalize_query(query)))
+
+
+def put_search(query: str, response: dict) -> None:
+    """Store a search response under its normalized query, with a TTL."""
+    key = make_key("search", normalize_query(query))
+    _search_cache.set(key, response, expire=SEARCH_TTL_SECONDS)
@@ -1,11 +1,24 @@
 """Claim extraction using LLM (Groq - FREE)."""
 
-import json
+import asyncio
+import orjson
 import os
+import re
 import streamlit as st
 from typing import List, Tuple
-from groq import Groq
+from groq import AsyncGroq
+from . import cache
 from .models import Claim
+from .streaming import collect_json_response
+
+
+# Compiled once at import; used on every LLM response
+_JSON_FENCE_RE = re.compile(r'```json\s*([\s\S]*?)\s*```')
+_JSON_ARRAY_RE = re.compile(r'\[\s*\{[\s\S]*\}\s*\]')
+_ANY_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+
+# Target size for a chunk of combined page text sent to the LLM
+MAX_CHUNK_CHARS = 10000
 
 
 CLAIM_EXTRACTION_PROMPT = """You are a fact-checking assistant. Your task is to extract specific, verifiable claims from the given text.
@@ -50,42 +63,135 @@ def extract_claims(pages: List[Tuple[int, str]], api_key: str) -> List[Claim]:
     Returns:
         List of extracted claims.
     """
-    client = Groq(api_key=api_key)
     all_claims = []
-    
-    # Process pages in batches to get more context
-    combined_text = ""
-    page_map = {}
-    
-    for page_num, text in pages:
-        if not text.strip():
-            continue
-        
-        start_pos = len(combined_text)
-        combined_text += f"\n\n--- Page {page_num} ---\n\n{text}"
-        page_map[start_pos] = page_num
-    
-    if not combined_text.strip():
+
+    # Pack whole pages into chunks so no page is split mid-sentence
+    chunk_infos = _build_chunks(pages)
+
+    if not chunk_infos:
         st.warning("No text content found in PDF")
         return []
-    
-    # Process in chunks if too long
-    chunks = []
-    if len(combined_text) > 12000:
-        # Split into chunks of ~10000 chars
-        for i in range(0, len(combined_text), 10000):
-            chunk = combined_text[i:i+12000]
-            chunks.append(chunk)
-    else:
-        chunks = [combined_text]
-    
+
+    chunks = [chunk for chunk, _ in chunk_infos]
+
+
     st.info(f"Processing {len(chunks)} text chunk(s) using Groq (FREE)...")
-    
-    for chunk_idx, chunk in enumerate(chunks):
-        try:
-            st.text(f"Analyzing chunk {chunk_idx + 1}/{len(chunks)}...")
-            
-            response = client.chat.completions.create(
+
+    # Fetch all chunk responses concurrently; order matches chunks
+    contents = asyncio.run(_fetch_chunk_responses(chunks, api_key))
+
+    for chunk_idx, content in enumerate(contents):
+        if isinstance(content, Exception):
+            st.error(f"Error extracting claims from chunk {chunk_idx + 1}: {str(content)}")
+            continue
+
+        # Debug: show raw response
+        with st.expander(f"Debug: Raw LLM Response (chunk {chunk_idx + 1})"):
+            st.code(content[:2000] + "..." if len(content) > 2000 else content)
+
+        # Parse JSON response
+        claims_data = parse_claims_json(content)
+
+        st.text(f"Found {len(claims_data)} claims in chunk {chunk_idx + 1}")
+
+        chunk, markers = chunk_infos[chunk_idx]
+        for claim_data in claims_data:
+            claim_text = claim_data.get("claim", "")
+            claim = Claim(
+                text=claim_text,
+                context=claim_data.get("context", ""),
+                page_number=_page_for_claim(claim_text, chunk, markers),
+                claim_type=claim_data.get("claim_type", "factual")
+            )
+            if claim.text:
+                all_claims.append(claim)
+
+    return all_claims
+
+
+def _build_chunks(pages: List[Tuple[int, str]]) -> List[Tuple[str, List[Tuple[int, int]]]]:
+    """
+    Pack whole pages greedily into chunks of up to MAX_CHUNK_CHARS.
+
+    Splitting on page boundaries instead of fixed character strides avoids
+    cutting sentences in half and extracting the same claim twice from
+    overlapping chunks. A single page larger than the cap becomes its own
+    chunk.
+
+    Args:
+        pages: List of (page_number, text) tuples.
+
+    Returns:
+        List of (chunk_text, markers) tuples, where markers holds the
+        (offset, page_number) of each page's start within the chunk.
+    """
+    chunks = []
+    parts = []
+    markers = []
+    cursor = 0
+
+    for page_num, text in pages:
+        if not text.strip():
+            continue
+
+        part = f"\n\n--- Page {page_num} ---\n\n{text}"
+
+        if parts and cursor + len(part) > MAX_CHUNK_CHARS:
+            chunks.append(("".join(parts), markers))
+            parts = []
+            markers = []
+            cursor = 0
+
+        markers.append((cursor, page_num))
+        parts.append(part)
+        cursor += len(part)
+
+    if parts:
+        chunks.append(("".join(parts), markers))
+
+    return chunks
+
+
+def _page_for_claim(claim_text: str, chunk: str, markers: List[Tuple[int, int]]) -> int:
+    """
+    Locate the page a claim came from within its chunk.
+
+    Falls back to the chunk's first page when the claim was paraphrased and
+    its text cannot be found verbatim.
+    """
+    pos = chunk.find(claim_text[:80]) if claim_text else -1
+    if pos == -1:
+        return markers[0][1]
+
+    page_number = markers[0][1]
+    for offset, page_num in markers:
+        if offset > pos:
+            break
+        page_number = page_num
+
+    return page_number
+
+
+async def _fetch_chunk_responses(chunks: List[str], api_key: str) -> List:
+    """
+    Request claim extraction for all chunks concurrently.
+
+    Args:
+        chunks: Text chunks to analyze.
+        api_key: Groq API key.
+
+    Returns:
+        Raw LLM responses in chunk order; failed chunks yield the exception.
+    """
+    client = AsyncGroq(api_key=api_key)
+
+    async def fetch(chunk: str) -> str:
+        # Identical chunks (e.g. re-uploaded PDFs) skip the LLM entirely
+        cache_key = cache.make_key(cache.PROMPT_VERSION, "llama-3.1-8b-instant", chunk)
+        content = cache.get(cache_key)
+
+        if content is None:
+            stream = await client.chat.completions.create(
                 model="llama-3.1-8b-instant",  # Fast, free model
                 messages=[
                     {
@@ -98,37 +204,21 @@ def extract_claims(pages: List[Tuple[int, str]], api_key: str) -> List[Claim]:
                     }
                 ],
                 temperature=0.1,
-                max_tokens=4000
+                max_tokens=4000,
+                stream=True
             )
-            
-            content = response.choices[0].message.content
-            
-            # Debug: show raw response
-            with st.expander(f"Debug: Raw LLM Response (chunk {chunk_idx + 1})"):
-                st.code(content[:2000] + "..." if len(content) > 2000 else content)
-            
-            # Parse JSON response
-            claims_data = parse_claims_json(content)
-            
-            st.text(f"Found {len(claims_data)} claims in chunk {chunk_idx + 1}")
-            
-            for claim_data in claims_data:
-                claim = Claim(
-                    text=claim_data.get("claim", ""),
-                    context=claim_data.get("context", ""),
-                    page_number=1,  # Default to page 1 for combined processing
-                    claim_type=claim_data.get("claim_type", "factual")
-                )
-                if claim.text:
-                    all_claims.append(claim)
-                    
-        except Exception as e:
-            st.error(f"Error extracting claims from chunk {chunk_idx + 1}: {str(e)}")
-            import traceback
-            st.code(traceback.format_exc())
-            continue
-    
-    return all_claims
+
+            # Stop reading as soon as the claims array closes
+            content = await collect_json_response(stream)
+
+            # Only cache responses that parse into claims, so a transient bad
+            # generation isn't replayed forever
+            if parse_claims_json(content):
+                cache.put(cache_key, content)
+
+        return content
+
+    return list(await asyncio.gather(*(fetch(c) for c in chunks), return_exceptions=True))
 
 
 def parse_claims_json(content: str) -> List[dict]:
@@ -141,14 +231,12 @@ def parse_claims_json(content: str) -> List[dict]:
     Returns:
         List of claim dictionaries.
     """
-    import re
-    
     # Try to find JSON array in the response
     content = content.strip()
-    
+
     # Remove markdown code blocks if present
     if "```json" in content:
-        match = re.search(r'```json\s*([\s\S]*?)\s*```', content)
+        match = _JSON_FENCE_RE.search(content)
         if match:
             content = match.group(1)
     elif content.startswith("```"):
@@ -162,25 +250,25 @@ def parse_claims_json(content: str) -> List[dict]:
     content = content.strip()
     
     try:
-        data = json.loads(content)
+        data = orjson.loads(content)
         if isinstance(data, list):
             return data
         return []
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError:
         # Try to extract JSON array from the text
-        match = re.search(r'\[\s*\{[\s\S]*\}\s*\]', content)
+        match = _JSON_ARRAY_RE.search(content)
         if match:
             try:
-                return json.loads(match.group())
+                return orjson.loads(match.group())
             except:
                 pass
-        
+
         # Last resort: try to find any array
-        match = re.search(r'\[[\s\S]*\]', content)
+        match = _ANY_ARRAY_RE.search(content)
         if match:
             try:
-                return json.loads(match.group())
+                return orjson.loads(match.group())
             except:
                 pass
-        
+
         return []
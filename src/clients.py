@@ -0,0 +1,15 @@
+"""Shared API clients, cached per key so connection pools survive reruns."""
+
+import streamlit as st
+from tavily import TavilyClient
+
+
+@st.cache_resource(max_entries=4)
+def get_tavily_client(api_key: str) -> TavilyClient:
+    """
+    Return a Tavily client shared across Streamlit reruns.
+
+    Constructing a client per call discards its HTTP connection pool, so
+    every rerun would pay the TCP/TLS handshake again.
+    """
+    return TavilyClient(api_key=api_key)
@@ -13,16 +13,16 @@ class VerificationStatus(Enum):
     PENDING = "Pending"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Claim:
     """Represents a single claim extracted from a document."""
     text: str
     context: str
     page_number: int
     claim_type: str = ""  # e.g., "statistic", "date", "financial", "technical"
-    
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Source:
     """A source used for verification."""
     title: str
@@ -30,7 +30,7 @@ class Source:
     snippet: str
 
 
-@dataclass
+@dataclass(slots=True)
 class VerificationResult:
     """Result of verifying a claim."""
     claim: Claim
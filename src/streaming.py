@@ -0,0 +1,55 @@
+"""Helpers for streamed LLM responses."""
+
+
+async def collect_json_response(stream) -> str:
+    """
+    Accumulate a streamed chat completion until its top-level JSON value closes.
+
+    Tracks brace/bracket depth (skipping string literals) and stops reading as
+    soon as the first top-level object or array is complete, so generation ends
+    there instead of running on toward max_tokens.
+
+    Args:
+        stream: Async chat-completion stream from Groq.
+
+    Returns:
+        The accumulated response text.
+    """
+    parts = []
+    depth = 0
+    started = False
+    in_string = False
+    escaped = False
+
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not delta:
+            continue
+
+        parts.append(delta)
+
+        for char in delta:
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+                started = True
+            elif char in '}]':
+                # Closers before the JSON opens (e.g. prose preamble) must not
+                # drive depth negative and trigger a premature stop
+                if started:
+                    depth -= 1
+
+        if started and depth <= 0:
+            break
+
+    await stream.close()
+
+    return "".join(parts)
@@ -1,10 +1,36 @@
 """Claim verification using web search and LLM analysis (Groq - FREE)."""
 
-import json
+import asyncio
+import orjson
+import re
 from typing import List
-from groq import Groq
+from groq import AsyncGroq
 from tavily import TavilyClient
+from . import cache
+from .clients import get_tavily_client
 from .models import Claim, VerificationResult, VerificationStatus, Source
+from .streaming import collect_json_response
+
+
+# Cap on simultaneous in-flight verifications to stay within Groq/Tavily rate limits
+MAX_CONCURRENT_VERIFICATIONS = 8
+
+# Claims bundled into a single Groq call; keeps prompts well inside the context window
+VERIFICATION_BATCH_SIZE = 5
+
+# Compiled once at import; used on every LLM verdict
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*\}')
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+
+# Strips punctuation/whitespace so restated claims collapse to one key
+_CLAIM_DEDUP_RE = re.compile(r'[\W_]+')
+
+# A claim needs at least one number, currency amount, percentage, year, or
+# proper-noun pair to be worth a web search
+_VERIFIABLE_RE = re.compile(r'(\d|\$|€|£|%|\b(19|20)\d{2}\b|[A-Z][a-z]+ [A-Z])')
+
+# Explanation prefix marking results that errored out rather than got a verdict
+FAILURE_EXPLANATION_PREFIX = "Verification failed"
 
 
 VERIFICATION_PROMPT = """You are a fact-checking assistant. Your task is to verify if a claim is accurate based on the search results provided.
@@ -37,6 +63,43 @@ Be precise and cite specific data from the search results. If the search results
 """
 
 
+BATCH_VERIFICATION_PROMPT = """You are a fact-checking assistant. Your task is to verify whether each of the following claims is accurate based on the search results provided for it.
+
+{claim_blocks}
+
+For each claim, determine if it is:
+1. **VERIFIED** - The claim matches current, reliable data
+2. **INACCURATE** - The claim contains outdated or slightly wrong information (e.g., old statistics, wrong dates, old GDP figures)
+3. **FALSE** - The claim is demonstrably false or no credible evidence supports it
+
+IMPORTANT: If a claim contains data from 2019 or earlier, and its search results show different current data, mark it as INACCURATE and provide the correct current information.
+
+Respond with a JSON array containing exactly {num_claims} objects, one per claim, in the same order:
+[
+    {{
+        "claim_number": 1,
+        "status": "VERIFIED" | "INACCURATE" | "FALSE",
+        "explanation": "Brief explanation of your verdict",
+        "correct_info": "If inaccurate/false, provide the correct information here. Otherwise null.",
+        "confidence": 0.0 to 1.0
+    }}
+]
+
+Be precise and cite specific data from the search results. If a claim's search results don't contain relevant information, mark it as FALSE with low confidence.
+"""
+
+
+CLAIM_BLOCK_TEMPLATE = """CLAIM {number}:
+"{claim}"
+
+CONTEXT FROM DOCUMENT:
+"{context}"
+
+SEARCH RESULTS FOR CLAIM {number}:
+{search_results}
+"""
+
+
 def verify_claims(
     claims: List[Claim],
     groq_api_key: str,
@@ -55,33 +118,310 @@ def verify_claims(
     Returns:
         List of verification results.
     """
-    groq_client = Groq(api_key=groq_api_key)
-    tavily_client = TavilyClient(api_key=tavily_api_key)
-    
+    # Documents often restate the same figure; verify each unique claim once.
+    # Claims with nothing concrete to search for are skipped entirely.
+    unique_claims = []
+    representative = []  # index into unique_claims for each claim, or None if skipped
+    seen = {}
+
+    for claim in claims:
+        if not _VERIFIABLE_RE.search(claim.text):
+            representative.append(None)
+            continue
+
+        key = _CLAIM_DEDUP_RE.sub('', claim.text.lower())
+        idx = seen.get(key)
+        if idx is None:
+            idx = seen[key] = len(unique_claims)
+            unique_claims.append(claim)
+        representative.append(idx)
+
+    unique_results = asyncio.run(
+        _verify_claims_async(unique_claims, groq_api_key, tavily_api_key, progress_callback)
+    ) if unique_claims else []
+
+    # Replicate each verdict to its duplicates, re-attached to their own Claim
     results = []
-    
-    for i, claim in enumerate(claims):
-        if progress_callback:
-            progress_callback(i + 1, len(claims), claim.text[:50] + "...")
-        
-        try:
-            result = verify_single_claim(claim, groq_client, tavily_client)
-            results.append(result)
-        except Exception as e:
-            # Create a failed verification result
+    for claim, idx in zip(claims, representative):
+        if idx is None:
             results.append(VerificationResult(
                 claim=claim,
                 status=VerificationStatus.PENDING,
-                explanation=f"Verification failed: {str(e)}",
+                explanation="No concrete verifiable content (no number, date, or named entity), so web verification was skipped.",
                 confidence=0.0
             ))
-    
+            continue
+
+        result = unique_results[idx]
+        if result.claim is not claim:
+            result = VerificationResult(
+                claim=claim,
+                status=result.status,
+                explanation=result.explanation,
+                correct_info=result.correct_info,
+                sources=result.sources,
+                confidence=result.confidence
+            )
+        results.append(result)
+
     return results
 
 
-def verify_single_claim(
+def is_failed_result(result: VerificationResult) -> bool:
+    """Whether a result reflects a verification error rather than a verdict."""
+    return (
+        result.status == VerificationStatus.PENDING
+        and result.explanation.startswith(FAILURE_EXPLANATION_PREFIX)
+    )
+
+
+async def _verify_claims_async(
+    claims: List[Claim],
+    groq_api_key: str,
+    tavily_api_key: str,
+    progress_callback=None
+) -> List[VerificationResult]:
+    """
+    Verify all claims concurrently with bounded parallelism.
+
+    Evidence for every claim is gathered first (concurrent Tavily searches),
+    then claims are verified in batched Groq calls of VERIFICATION_BATCH_SIZE,
+    falling back to one call per claim if a batch response is unusable.
+    """
+    # The async Groq client is bound to this run's event loop, so it is
+    # constructed per run; the sync Tavily client is shared across reruns
+    groq_client = AsyncGroq(api_key=groq_api_key)
+    tavily_client = get_tavily_client(tavily_api_key)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_VERIFICATIONS)
+    completed = 0
+    results: dict = {}
+
+    def report_progress(claim: Claim):
+        nonlocal completed
+        completed += 1
+        if progress_callback:
+            progress_callback(completed, len(claims), claim.text[:50] + "...")
+
+    # Phase 1: gather search evidence for every claim concurrently
+    async def gather_evidence(claim: Claim):
+        async with semaphore:
+            return await _gather_evidence(claim, tavily_client)
+
+    evidence = await asyncio.gather(
+        *(gather_evidence(c) for c in claims), return_exceptions=True
+    )
+
+    # Resolve failed searches and cached verdicts without any LLM call
+    pending = []
+    for i, claim in enumerate(claims):
+        if isinstance(evidence[i], Exception):
+            results[i] = VerificationResult(
+                claim=claim,
+                status=VerificationStatus.PENDING,
+                explanation=f"{FAILURE_EXPLANATION_PREFIX}: {str(evidence[i])}",
+                confidence=0.0
+            )
+            report_progress(claim)
+            continue
+
+        search_results, sources = evidence[i]
+        cached = cache.get(_verdict_cache_key(claim, search_results))
+        if cached is not None:
+            results[i] = _build_result(claim, parse_verdict(cached), sources)
+            report_progress(claim)
+        else:
+            pending.append(i)
+
+    # Phase 2: verify remaining claims in batched Groq calls, grouped by
+    # claim type so each batch gets a coherent prompt
+    batches = []
+    by_type: dict = {}
+    for i in pending:
+        by_type.setdefault(claims[i].claim_type, []).append(i)
+    for indices in by_type.values():
+        for start in range(0, len(indices), VERIFICATION_BATCH_SIZE):
+            batches.append(indices[start:start + VERIFICATION_BATCH_SIZE])
+
+    async def run_batch(batch: List[int]):
+        async with semaphore:
+            batch_results = await verify_claim_batch(
+                [claims[i] for i in batch],
+                [evidence[i][0] for i in batch],
+                groq_client
+            )
+
+        if batch_results is not None:
+            for i, verdict in zip(batch, batch_results):
+                search_results, sources = evidence[i]
+                cache.put(_verdict_cache_key(claims[i], search_results), orjson.dumps(verdict).decode())
+                results[i] = _build_result(claims[i], _map_verdict(verdict), sources)
+                report_progress(claims[i])
+            return
+
+        # Batch response was unusable; retry each claim individually
+        for i in batch:
+            async with semaphore:
+                try:
+                    results[i] = await verify_single_claim(
+                        claims[i], groq_client, tavily_client
+                    )
+                except Exception as e:
+                    results[i] = VerificationResult(
+                        claim=claims[i],
+                        status=VerificationStatus.PENDING,
+                        explanation=f"{FAILURE_EXPLANATION_PREFIX}: {str(e)}",
+                        confidence=0.0
+                    )
+            report_progress(claims[i])
+
+    await asyncio.gather(*(run_batch(b) for b in batches))
+
+    return [results[i] for i in range(len(claims))]
+
+
+async def verify_claim_batch(
+    claims: List[Claim],
+    search_results: List[str],
+    groq_client: AsyncGroq
+):
+    """
+    Verify a batch of claims in a single Groq call.
+
+    Args:
+        claims: Claims to verify together.
+        search_results: Formatted search evidence, one entry per claim.
+        groq_client: Groq client.
+
+    Returns:
+        One raw verdict dict per claim, in order, or None if the response
+        could not be parsed into exactly len(claims) verdicts.
+    """
+    claim_blocks = "\n\n".join(
+        CLAIM_BLOCK_TEMPLATE.format(
+            number=n,
+            claim=claim.text,
+            context=claim.context,
+            search_results=evidence
+        )
+        for n, (claim, evidence) in enumerate(zip(claims, search_results), 1)
+    )
+
+    prompt = BATCH_VERIFICATION_PROMPT.format(
+        claim_blocks=claim_blocks,
+        num_claims=len(claims)
+    )
+
+    try:
+        stream = await groq_client.chat.completions.create(
+            model="llama-3.1-8b-instant",
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a precise fact-checker. Analyze claims against search results and provide accurate verdicts. Always respond with valid JSON only."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            temperature=0.1,
+            max_tokens=500 * len(claims),
+            stream=True
+        )
+        # Stop reading as soon as the verdict array closes
+        content = await collect_json_response(stream)
+        return parse_batch_verdicts(content, len(claims))
+    except Exception:
+        # An unusable batch must return None so callers fall back per claim
+        return None
+
+
+def parse_batch_verdicts(content: str, num_claims: int):
+    """
+    Parse a batched verdict response into one raw dict per claim.
+
+    Returns None unless exactly num_claims verdicts can be recovered.
+    """
+    content = content.strip()
+
+    # Remove markdown code blocks if present
+    if content.startswith("```"):
+        lines = content.split("\n")
+        content = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
+
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        match = _JSON_ARRAY_RE.search(content)
+        if not match:
+            return None
+        try:
+            data = orjson.loads(match.group())
+        except orjson.JSONDecodeError:
+            return None
+
+    if not isinstance(data, list) or len(data) != num_claims:
+        return None
+    if not all(isinstance(item, dict) for item in data):
+        return None
+
+    # Honor claim_number ordering if the model supplied it consistently;
+    # missing or non-integer numbers leave the response order untouched
+    numbers = [item.get("claim_number") for item in data]
+    if (all(isinstance(n, int) for n in numbers)
+            and sorted(numbers) == list(range(1, num_claims + 1))):
+        data = sorted(data, key=lambda item: item["claim_number"])
+
+    return data
+
+
+async def _gather_evidence(claim: Claim, tavily_client: TavilyClient):
+    """Search for a claim's evidence; returns (formatted results, sources)."""
+    search_query = generate_search_query(claim)
+
+    try:
+        # Near-duplicate claims often produce identical queries; reuse results
+        search_response = cache.get_search(search_query)
+
+        if search_response is None:
+            # Tavily's SDK is synchronous, so run it off the event loop
+            search_response = await asyncio.to_thread(
+                tavily_client.search,
+                query=search_query,
+                search_depth="advanced",
+                max_results=5
+            )
+            cache.put_search(search_query, search_response)
+
+        return format_search_results(search_response), extract_sources(search_response)
+
+    except Exception as e:
+        raise ValueError(f"Search failed: {str(e)}")
+
+
+def _verdict_cache_key(claim: Claim, search_results: str) -> str:
+    """Cache key for a verdict on a (claim, evidence) pair."""
+    return cache.make_key(
+        cache.PROMPT_VERSION, "llama-3.1-8b-instant", claim.text, search_results
+    )
+
+
+def _build_result(claim: Claim, verdict: dict, sources: List[Source]) -> VerificationResult:
+    """Assemble a VerificationResult from a mapped verdict."""
+    return VerificationResult(
+        claim=claim,
+        status=verdict["status"],
+        explanation=verdict["explanation"],
+        correct_info=verdict.get("correct_info"),
+        sources=sources,
+        confidence=verdict.get("confidence", 0.5)
+    )
+
+
+async def verify_single_claim(
     claim: Claim,
-    groq_client: Groq,
+    groq_client: AsyncGroq,
     tavily_client: TavilyClient
 ) -> VerificationResult:
     """
@@ -96,21 +436,8 @@ def verify_single_claim(
         Verification result.
     """
     # Search for information about the claim
-    search_query = generate_search_query(claim)
-    
-    try:
-        search_response = tavily_client.search(
-            query=search_query,
-            search_depth="advanced",
-            max_results=5
-        )
-        
-        search_results = format_search_results(search_response)
-        sources = extract_sources(search_response)
-        
-    except Exception as e:
-        raise ValueError(f"Search failed: {str(e)}")
-    
+    search_results, sources = await _gather_evidence(claim, tavily_client)
+
     # Analyze with LLM
     prompt = VERIFICATION_PROMPT.format(
         claim=claim.text,
@@ -119,34 +446,38 @@ def verify_single_claim(
     )
     
     try:
-        response = groq_client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise fact-checker. Analyze claims against search results and provide accurate verdicts. Always respond with valid JSON only."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.1,
-            max_tokens=500
-        )
-        
-        content = response.choices[0].message.content
-        verdict = parse_verdict(content)
-        
-        return VerificationResult(
-            claim=claim,
-            status=verdict["status"],
-            explanation=verdict["explanation"],
-            correct_info=verdict.get("correct_info"),
-            sources=sources,
-            confidence=verdict.get("confidence", 0.5)
-        )
-        
+        # Identical (claim, evidence) pairs resolve from cache without an LLM call
+        cache_key = _verdict_cache_key(claim, search_results)
+        content = cache.get(cache_key)
+
+        if content is None:
+            stream = await groq_client.chat.completions.create(
+                model="llama-3.1-8b-instant",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You are a precise fact-checker. Analyze claims against search results and provide accurate verdicts. Always respond with valid JSON only."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.1,
+                max_tokens=500,
+                stream=True
+            )
+
+            # Stop reading as soon as the verdict object closes
+            content = await collect_json_response(stream)
+
+            # Only cache responses that yield a verdict, so a transient bad
+            # generation isn't replayed forever
+            if extract_verdict_data(content) is not None:
+                cache.put(cache_key, content)
+
+        return _build_result(claim, parse_verdict(content), sources)
+
     except Exception as e:
         raise ValueError(f"LLM analysis failed: {str(e)}")
 
@@ -202,37 +533,50 @@ def extract_sources(response: dict) -> List[Source]:
 
 def parse_verdict(content: str) -> dict:
     """Parse the LLM verdict response."""
+    data = extract_verdict_data(content)
+    return _map_verdict(data if data is not None else {})
+
+
+def extract_verdict_data(content: str):
+    """
+    Pull the raw verdict dict out of an LLM response.
+
+    Returns None when no JSON object can be recovered, so callers can tell a
+    bad generation apart from a parseable verdict.
+    """
     content = content.strip()
-    
+
     # Remove markdown code blocks if present
     if content.startswith("```"):
         lines = content.split("\n")
         content = "\n".join(lines[1:-1] if lines[-1].startswith("```") else lines[1:])
-    
+
     try:
-        data = json.loads(content)
-    except json.JSONDecodeError:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
         # Try to extract JSON from the text
-        import re
-        match = re.search(r'\{[\s\S]*\}', content)
-        if match:
-            try:
-                data = json.loads(match.group())
-            except:
-                data = {}
-        else:
-            data = {}
-    
-    # Map status string to enum
+        match = _JSON_OBJECT_RE.search(content)
+        if not match:
+            return None
+        try:
+            data = orjson.loads(match.group())
+        except orjson.JSONDecodeError:
+            return None
+
+    return data if isinstance(data, dict) else None
+
+
+def _map_verdict(data: dict) -> dict:
+    """Map a raw verdict dict onto validated result fields."""
     status_map = {
         "VERIFIED": VerificationStatus.VERIFIED,
         "INACCURATE": VerificationStatus.INACCURATE,
         "FALSE": VerificationStatus.FALSE
     }
-    
+
     status_str = data.get("status", "FALSE").upper()
     status = status_map.get(status_str, VerificationStatus.FALSE)
-    
+
     return {
         "status": status,
         "explanation": data.get("explanation", "Could not determine verdict"),